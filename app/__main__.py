@@ -0,0 +1,20 @@
+"""
+Production server entrypoint: `python -m app`
+"""
+
+import uvicorn
+
+from .config import settings
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.worker_count,
+        loop="uvloop",
+        http="httptools",
+        backlog=4096,
+        limit_concurrency=1024,
+    )
@@ -1,6 +1,5 @@
 """Configuration settings for the application."""
 
-import os
 from typing import Optional
 from pydantic_settings import BaseSettings
 
@@ -12,14 +11,27 @@ class Settings(BaseSettings):
     app_name: str = "KUMC Anam Medical Portal"
     app_version: str = "0.1.0"
     debug: bool = False
+    # Jinja bytecode cache directory (None: Jinja's default temp directory)
+    jinja_cache_dir: Optional[str] = None
     
     # Security settings
-    secret_key: str = os.environ.get("SECRET_KEY", "your-super-secret-key-change-in-production")
+    secret_key: str = "your-super-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
     
+    # CORS settings
+    frontend_origin: str = "http://localhost:8000"
+    
     # KUMC API settings
     default_hospital_code: str = "AA"
+    response_cache_ttl: int = 60
+    session_idle_minutes: int = 30
+    
+    # Server settings
+    host: str = "0.0.0.0"
+    port: int = 8000
+    # Sessions and caches live in process memory, so extra workers need sticky routing
+    worker_count: int = 1
     
     class Config:
         env_file = ".env"
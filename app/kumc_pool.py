@@ -0,0 +1,103 @@
+"""Pool of signed-in KUMC clients."""
+
+import time
+import httpx
+from cachetools import TLRUCache
+from fake_useragent import UserAgent
+from kumc.client import AnamClient
+from kumc.exception import LoginError
+
+
+class KUMCClientPool:
+    """
+    Pool of signed-in KUMC clients keyed by opaque session ID.
+
+    A client is signed in once at login and reused by every later API call
+    of that session until the session's access token expires or the session
+    sits idle for too long. Each client keeps its own cookie jar but all of
+    them share one keep-alive transport.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        idle_ttl: float = 1800.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Args:
+            max_sessions: Maximum number of live sessions kept in the pool.
+            idle_ttl: Seconds a session may go unused before it is evicted.
+            transport: Shared HTTP transport; the pool creates its own if omitted.
+        """
+        self.idle_ttl = idle_ttl
+        self._owns_transport = transport is None
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self._user_agent = UserAgent()
+        # Entries expire with their access token, or earlier once idle
+        self._sessions: TLRUCache = TLRUCache(
+            maxsize=max_sessions,
+            ttu=lambda _sid, entry, now: min(entry[1], now + self.idle_ttl),
+            timer=time.time,
+        )
+
+    def _create_client(self, username: str, password: str) -> AnamClient:
+        """Create a KUMC client bound to the shared transport."""
+        # AnamClient falls back to the process-wide ANAM_* environment variables
+        # when no credentials are given; never let a request sign in as those.
+        if not username or not password:
+            raise LoginError("Username and password are required")
+
+        session = httpx.AsyncClient(
+            headers={"User-Agent": self._user_agent.random},
+            transport=self.transport,
+        )
+        return AnamClient(session=session, username=username, password=password)
+
+    async def sign_in(self, username: str, password: str) -> AnamClient:
+        """
+        Create a new client and sign it in.
+
+        Args:
+            username: KUMC user ID.
+            password: KUMC password.
+
+        Returns:
+            Signed-in KUMC client.
+        """
+        client = self._create_client(username, password)
+        await client.sign_in()
+        return client
+
+    def register(self, session_id: str, client: AnamClient, expires_at: float) -> None:
+        """
+        Store a signed-in client under a session ID.
+
+        Args:
+            session_id: Opaque session ID carried in the access token.
+            client: Signed-in KUMC client.
+            expires_at: UNIX timestamp after which the session is evicted.
+        """
+        self._sessions[session_id] = (client, expires_at)
+
+    def get(self, session_id: str) -> AnamClient | None:
+        """Get the client of a live session, or None if it is unknown or expired."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+
+        # Re-insert to restart the idle timer
+        self._sessions[session_id] = entry
+        return entry[0]
+
+    def remove(self, session_id: str) -> None:
+        """Drop a session from the pool."""
+        self._sessions.pop(session_id, None)
+
+    async def close(self) -> None:
+        """Drop every session and close the transport if the pool owns it."""
+        # Per-client sessions are not closed individually since that would
+        # also close the shared transport.
+        self._sessions.clear()
+        if self._owns_transport:
+            await self.transport.aclose()
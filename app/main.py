@@ -2,42 +2,99 @@
 KUMC Anam Medical Portal - FastAPI Main Application
 """
 
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from pathlib import Path
+import json
+import os
+import httpx
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from .routes import router as api_router
+from .kumc_pool import KUMCClientPool
+from .static_files import CachedStaticFiles
 from .config import settings
 
 
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def create_bytecode_cache() -> FileSystemBytecodeCache | None:
+    """
+    Create the Jinja bytecode cache.
+    
+    Uses `settings.jinja_cache_dir` if set, otherwise Jinja's per-user temp directory.
+    Returns None (no cache) when the directory cannot be created or written.
+    """
+    try:
+        if settings.jinja_cache_dir is None:
+            return FileSystemBytecodeCache()
+        
+        directory = Path(settings.jinja_cache_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        if not os.access(directory, os.W_OK):
+            return None
+        return FileSystemBytecodeCache(str(directory))
+    except (OSError, RuntimeError):
+        return None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    app.state.http = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        http2=True,
+    )
+    app.state.kumc_pool = KUMCClientPool(
+        idle_ttl=settings.session_idle_minutes * 60,
+        transport=app.state.http,
+    )
+    yield
+    await app.state.kumc_pool.close()
+    await app.state.http.aclose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="고려대학교 안암병원 진료 정보 포털",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware (only the configured frontend origin may call the API)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[settings.frontend_origin],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 # Static files and templates
-BASE_DIR = Path(__file__).resolve().parent
-app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
-templates = Jinja2Templates(directory=BASE_DIR / "templates")
+app.mount("/static", CachedStaticFiles(directory=BASE_DIR / "static"), name="static")
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(BASE_DIR / "templates"),
+        autoescape=True,
+        # Only stat template files for changes while developing
+        auto_reload=settings.debug,
+        bytecode_cache=create_bytecode_cache(),
+    )
+)
 
 # Include API routes
 app.include_router(api_router)
 
+# Health check payload never changes at runtime, so serialize it once
+_HEALTH_BYTES = json.dumps({"status": "healthy", "version": settings.app_version}).encode()
+
 
 @app.get("/")
 async def index(request: Request):
@@ -52,6 +109,6 @@ async def dashboard(request: Request):
 
 
 @app.get("/health")
-async def health_check():
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy", "version": settings.app_version}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
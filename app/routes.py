@@ -1,204 +1,315 @@
 """API routes for KUMC medical portal."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Any
-from contextlib import asynccontextmanager
-from kumc import KUMCClient
+import asyncio
+import secrets
+import time
+from datetime import timedelta
+from types import MappingProxyType
+import httpx
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from typing import Any, Mapping, NamedTuple
+from kumc.client import AnamClient
+from kumc.exception import LoginError
 
 from .schemas import (
-    LoginRequest, LoginResponse, APIResponse,
-    ReservationRequest, LabTestRequest, MedicationRequest,
+    LoginRequest, LoginResponse, APIResponse, DashboardBundleResponse,
+    DateRangeRequest, ReservationRequest, LabTestRequest, MedicationRequest,
     CareHistoryRequest, PaymentListRequest, PaymentDetailRequest
 )
 from .security import create_access_token, get_current_user
+from .kumc_pool import KUMCClientPool
 from .config import settings
 
 
 router = APIRouter(prefix="/api", tags=["API"])
 
+# Successful KUMC query results keyed by (session ID, endpoint name, KUMC parameters)
+_response_cache: TTLCache = TTLCache(maxsize=10000, ttl=settings.response_cache_ttl)
 
-@asynccontextmanager
-async def get_authenticated_client(username: str, password: str):
+
+def invalidate_response_cache(session_id: str) -> None:
+    """Drop every cached KUMC query result of a session."""
+    for key in [key for key in _response_cache if key[0] == session_id]:
+        _response_cache.pop(key, None)
+
+
+def session_expired_error() -> HTTPException:
+    """Build the 401 returned when a session is unknown, expired or rejected by KUMC."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="세션이 만료되었습니다. 다시 로그인해주세요.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def is_upstream_auth_error(exc: BaseException) -> bool:
+    """Check whether a KUMC call failed because its login session is no longer valid."""
+    if isinstance(exc, LoginError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return 300 <= code < 400 or code in (401, 403)
+    return False
+
+
+def expire_session(pool: KUMCClientPool, session_id: str) -> HTTPException:
+    """Drop a session rejected by KUMC and build the 401 asking the user to log in again."""
+    pool.remove(session_id)
+    invalidate_response_cache(session_id)
+    return session_expired_error()
+
+
+def json_response(model: BaseModel) -> Response:
     """
-    Get an authenticated KUMC client as async context manager.
+    Serialize a response model straight to JSON bytes.
+    
+    pydantic-core encodes the model in one pass, instead of FastAPI dumping,
+    re-validating and re-encoding the (often large) KUMC payload.
     """
-    client = KUMCClient(username, password)
-    try:
-        # Initialize with credentials (kumc package uses environment variables by default,
-        # but we need to set them programmatically)
-        # Re-create client with new env vars
-        await client.sign_in()
-        yield client
-    finally:
-        if hasattr(client, 'session') and client.session:
-            await client.session.aclose()
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
-async def get_client_from_token(user: dict = Depends(get_current_user)):
+def get_kumc_pool(request: Request) -> KUMCClientPool:
+    """Dependency to get the application-wide KUMC client pool."""
+    return request.app.state.kumc_pool
+
+
+async def get_client_from_token(
+    user: dict = Depends(get_current_user),
+    pool: KUMCClientPool = Depends(get_kumc_pool)
+) -> AnamClient:
     """Dependency to get authenticated client from JWT token."""
-    return user
+    client = pool.get(user["sid"])
+    
+    if client is None:
+        raise session_expired_error()
+    
+    return client
 
 
 @router.post("/auth/login", response_model=LoginResponse)
-async def login(request: LoginRequest) -> LoginResponse:
+async def login(
+    request: LoginRequest,
+    pool: KUMCClientPool = Depends(get_kumc_pool)
+) -> LoginResponse:
     """
     Authenticate user with KUMC credentials.
     
-    Returns a JWT token for subsequent API calls.
+    Signs in once and keeps the client in the pool under an opaque session ID.
+    Returns a JWT token carrying that session ID for subsequent API calls.
     """
     try:
-        async with get_authenticated_client(request.username, request.password) as client:
-            # If we get here, login was successful
-            access_token = create_access_token(
-                data={"sub": request.username, "pwd": request.password}
-            )
-            
-            return LoginResponse(
-                success=True,
-                message="로그인 성공",
-                access_token=access_token
-            )
+        client = await pool.sign_in(request.username, request.password)
     except Exception as e:
         return LoginResponse(
             success=False,
             message=f"로그인 실패: {str(e)}"
         )
+    
+    session_id = secrets.token_urlsafe(24)
+    expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
+    pool.register(session_id, client, expires_at=time.time() + expires_delta.total_seconds())
+    
+    access_token = create_access_token(
+        data={"sub": request.username, "sid": session_id},
+        expires_delta=expires_delta
+    )
+    
+    return LoginResponse(
+        success=True,
+        message="로그인 성공",
+        access_token=access_token
+    )
+
+
+@router.post("/auth/logout", response_model=APIResponse)
+async def logout(
+    user: dict = Depends(get_current_user),
+    pool: KUMCClientPool = Depends(get_kumc_pool)
+) -> APIResponse:
+    """Drop the session of the current access token."""
+    pool.remove(user["sid"])
+    invalidate_response_cache(user["sid"])
+    return APIResponse(success=True, message="로그아웃 되었습니다.")
 
 
 @router.get("/user/info", response_model=APIResponse)
-async def get_user_info(user: dict = Depends(get_client_from_token)) -> APIResponse:
+async def get_user_info(
+    user: dict = Depends(get_current_user),
+    client: AnamClient = Depends(get_client_from_token),
+    pool: KUMCClientPool = Depends(get_kumc_pool)
+) -> Response:
     """Get authenticated user information."""
     try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_info()
-            return APIResponse(success=True, data=data)
+        data = await client.get_info()
+        return json_response(APIResponse(success=True, data=data))
     except Exception as e:
-        return APIResponse(success=False, message=str(e))
+        if is_upstream_auth_error(e):
+            raise expire_session(pool, user["sid"]) from e
+        return json_response(APIResponse(success=False, message=str(e)))
 
 
-@router.post("/reservations", response_model=APIResponse)
-async def get_reservations(
-    request: ReservationRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get user reservations within date range."""
-    try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_reservations(
-                hpCd=request.hospital_code,
-                apstYmd=request.start_date,
-                apfnYmd=request.end_date
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+class RouteSpec(NamedTuple):
+    """Declarative description of a KUMC query endpoint."""
+    path: str
+    name: str
+    description: str
+    request_model: type[BaseModel]
+    client_method: str
+    params: Mapping[str, str]
+    fixed_params: Mapping[str, Any] = MappingProxyType({})
 
 
-@router.post("/lab-tests", response_model=APIResponse)
-async def get_lab_test_results(
-    request: LabTestRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get lab test (diagnostic test) results within date range."""
-    try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_health_check_result(
-                hpCd=request.hospital_code,
-                strtYmd=request.start_date,
-                fnshYmd=request.end_date
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+# KUMC query endpoints: client method plus mapping of KUMC parameters to request fields
+ROUTE_SPECS = [
+    RouteSpec(
+        "/reservations", "get_reservations",
+        "Get user reservations within date range.",
+        ReservationRequest, "get_reservations",
+        {"hpCd": "hospital_code", "apstYmd": "start_date", "apfnYmd": "end_date"}
+    ),
+    RouteSpec(
+        "/lab-tests", "get_lab_test_results",
+        "Get lab test (diagnostic test) results within date range.",
+        LabTestRequest, "get_health_check_result",
+        {"hpCd": "hospital_code", "strtYmd": "start_date", "fnshYmd": "end_date"}
+    ),
+    RouteSpec(
+        "/medications", "get_medication_history",
+        "Get medication prescription history within date range.",
+        MedicationRequest, "get_medication_prescription_history",
+        {"hpCd": "hospital_code", "ordrYmd1": "start_date", "ordrYmd2": "end_date"}
+    ),
+    RouteSpec(
+        "/outpatient-history", "get_outpatient_history",
+        "Get outpatient (ambulatory) care history within date range.",
+        CareHistoryRequest, "get_ambulatory_care_history",
+        {"hpCd": "hospital_code", "inqrStrtYmd": "start_date", "inqrFnshYmd": "end_date"},
+        {"inqrDvsnCd": 2}
+    ),
+    RouteSpec(
+        "/hospitalization-history", "get_hospitalization_history",
+        "Get hospitalization and discharge history within date range.",
+        CareHistoryRequest, "get_hospitalization_and_discharge_history",
+        {"hpCd": "hospital_code", "inqrStrtYmd": "start_date", "inqrFnshYmd": "end_date"},
+        {"inqrDvsnCd": 3}
+    ),
+    RouteSpec(
+        "/payments", "get_payment_list",
+        "Get payment completed list within date range.",
+        PaymentListRequest, "get_payed_list",
+        {"hpCd": "hospital_code", "strtYmd": "start_date", "fnshYmd": "end_date", "codvCd": "code_division"}
+    ),
+    RouteSpec(
+        "/payments/detail", "get_payment_detail",
+        "Get payment detail by payment number.",
+        PaymentDetailRequest, "get_payed_detail",
+        {"hpCd": "hospital_code", "mdrpNo": "mdrp_no"}
+    ),
+]
 
+ROUTE_SPECS_BY_NAME = {spec.name: spec for spec in ROUTE_SPECS}
 
-@router.post("/medications", response_model=APIResponse)
-async def get_medication_history(
-    request: MedicationRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get medication prescription history within date range."""
-    try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_medication_prescription_history(
-                hpCd=request.hospital_code,
-                ordrYmd1=request.start_date,
-                ordrYmd2=request.end_date
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+# Dashboard bundle sections and the query endpoint each one mirrors
+DASHBOARD_SECTIONS = {
+    "reservations": "get_reservations",
+    "lab_tests": "get_lab_test_results",
+    "medications": "get_medication_history",
+    "outpatient": "get_outpatient_history",
+    "hospitalization": "get_hospitalization_history",
+}
 
 
-@router.post("/outpatient-history", response_model=APIResponse)
-async def get_outpatient_history(
-    request: CareHistoryRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get outpatient (ambulatory) care history within date range."""
+async def call_kumc(
+    client: AnamClient,
+    spec: RouteSpec,
+    request: BaseModel,
+    session_id: str
+) -> Any:
+    """
+    Call the KUMC client method described by a route spec.
+    
+    Successful results are cached per session for `settings.response_cache_ttl` seconds.
+    """
+    params = {param: getattr(request, field) for param, field in spec.params.items()}
+    key = (session_id, spec.name, tuple(params.items()))
+    
     try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_ambulatory_care_history(
-                hpCd=request.hospital_code,
-                inqrStrtYmd=request.start_date,
-                inqrFnshYmd=request.end_date,
-                inqrDvsnCd=2
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+        return _response_cache[key]
+    except KeyError:
+        pass
+    
+    data = await getattr(client, spec.client_method)(**params, **spec.fixed_params)
+    _response_cache[key] = data
+    return data
 
 
-@router.post("/hospitalization-history", response_model=APIResponse)
-async def get_hospitalization_history(
-    request: CareHistoryRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get hospitalization and discharge history within date range."""
-    try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_hospitalization_and_discharge_history(
-                hpCd=request.hospital_code,
-                inqrStrtYmd=request.start_date,
-                inqrFnshYmd=request.end_date,
-                inqrDvsnCd=3
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+def make_handler(spec: RouteSpec):
+    """Build the endpoint function for a route spec."""
+    async def handler(
+        request: spec.request_model,
+        user: dict = Depends(get_current_user),
+        client: AnamClient = Depends(get_client_from_token),
+        pool: KUMCClientPool = Depends(get_kumc_pool)
+    ) -> Response:
+        try:
+            data = await call_kumc(client, spec, request, user["sid"])
+            return json_response(APIResponse(success=True, data=data))
+        except Exception as e:
+            if is_upstream_auth_error(e):
+                raise expire_session(pool, user["sid"]) from e
+            return json_response(APIResponse(success=False, message=str(e)))
+    
+    handler.__name__ = spec.name
+    handler.__doc__ = spec.description
+    return handler
 
 
-@router.post("/payments", response_model=APIResponse)
-async def get_payment_list(
-    request: PaymentListRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get payment completed list within date range."""
-    try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_payed_list(
-                hpCd=request.hospital_code,
-                strtYmd=request.start_date,
-                fnshYmd=request.end_date,
-                codvCd=request.code_division
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+def register_routes(specs: list[RouteSpec]) -> None:
+    """Add a POST endpoint to the router for every route spec."""
+    for spec in specs:
+        router.add_api_route(
+            spec.path,
+            make_handler(spec),
+            methods=["POST"],
+            response_model=APIResponse,
+            name=spec.name,
+        )
 
 
-@router.post("/payments/detail", response_model=APIResponse)
-async def get_payment_detail(
-    request: PaymentDetailRequest,
-    user: dict = Depends(get_client_from_token)
-) -> APIResponse:
-    """Get payment detail by payment number."""
-    try:
-        async with get_authenticated_client(user["username"], user["password"]) as client:
-            data = await client.get_payed_detail(
-                hpCd=request.hospital_code,
-                mdrpNo=request.mdrp_no
-            )
-            return APIResponse(success=True, data=data)
-    except Exception as e:
-        return APIResponse(success=False, message=str(e))
+register_routes(ROUTE_SPECS)
+
+
+@router.post("/dashboard-bundle", response_model=DashboardBundleResponse)
+async def get_dashboard_bundle(
+    request: DateRangeRequest,
+    user: dict = Depends(get_current_user),
+    client: AnamClient = Depends(get_client_from_token),
+    pool: KUMCClientPool = Depends(get_kumc_pool)
+) -> Response:
+    """
+    Get every dashboard section within date range in a single call.
+    
+    The upstream requests run concurrently; a failing section does not fail the others.
+    """
+    results = await asyncio.gather(
+        *(
+            call_kumc(client, ROUTE_SPECS_BY_NAME[name], request, user["sid"])
+            for name in DASHBOARD_SECTIONS.values()
+        ),
+        return_exceptions=True
+    )
+    
+    if any(is_upstream_auth_error(result) for result in results):
+        raise expire_session(pool, user["sid"])
+    
+    return json_response(DashboardBundleResponse(**{
+        section: (
+            APIResponse(success=False, message=str(result))
+            if isinstance(result, Exception)
+            else APIResponse(success=True, data=result)
+        )
+        for section, result in zip(DASHBOARD_SECTIONS, results)
+    }))
@@ -64,6 +64,15 @@ class APIResponse(BaseModel):
     data: Optional[Any] = None
 
 
+class DashboardBundleResponse(BaseModel):
+    """Dashboard bundle response schema - one result per dashboard section."""
+    reservations: APIResponse
+    lab_tests: APIResponse
+    medications: APIResponse
+    outpatient: APIResponse
+    hospitalization: APIResponse
+
+
 class UserInfo(BaseModel):
     """User information schema - matches KUMC API response."""
     instMemNo: Optional[str] = Field(None, description="기관회원번호")
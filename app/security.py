@@ -1,21 +1,37 @@
 """Security utilities for JWT token handling."""
 
+import functools
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from cachetools import TTLCache
+import jwt
+from jwt import PyJWTError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from .config import settings
 
 
-# Password hashing context (using Argon2 - winner of the Password Hashing Competition)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
 # HTTP Bearer security scheme
 security = HTTPBearer()
 
+# Verified token payloads keyed by token digest (TTL stays well below token expiry)
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+
+@functools.cache
+def get_pwd_context():
+    """
+    Get the password hashing context (using Argon2 - winner of the Password Hashing Competition).
+    
+    Built lazily so the Argon2 backend is only loaded when passwords are actually hashed.
+    """
+    from passlib.context import CryptContext
+    
+    return CryptContext(schemes=["argon2"], deprecated="auto")
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -57,7 +73,7 @@ def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         return payload
-    except JWTError:
+    except PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유효하지 않은 인증 토큰입니다.",
@@ -76,16 +92,28 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         User data from token payload.
     """
     token = credentials.credentials
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    cached = _token_cache.get(key)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > time.time():
+            return user
+        _token_cache.pop(key, None)
+    
     payload = decode_access_token(token)
     
     username = payload.get("sub")
-    password = payload.get("pwd")
+    session_id = payload.get("sid")
     
-    if username is None or password is None:
+    if username is None or session_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="인증 정보를 확인할 수 없습니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return {"username": username, "password": password}
+    user = {"username": username, "sid": session_id}
+    _token_cache[key] = (user, payload["exp"])
+    
+    return user
@@ -169,6 +169,15 @@ async function handleLogin(event) {
 
 // Handle logout
 function handleLogout() {
+    // Release the server-side session (best effort)
+    if (state.token) {
+        fetch(`${API_BASE_URL}/auth/logout`, {
+            method: 'POST',
+            headers: { 'Authorization': `Bearer ${state.token}` },
+            keepalive: true
+        }).catch(() => {});
+    }
+    
     localStorage.removeItem('access_token');
     state.token = null;
     state.isLoggedIn = false;
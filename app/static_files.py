@@ -0,0 +1,79 @@
+"""Static file serving with precompressed assets and cache headers."""
+
+import mimetypes
+import re
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+
+# Precompressed sibling suffixes in order of preference
+PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+# Content-hashed asset names such as `app.3f2a9c1d.js`
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[^./]+$")
+
+# Unhashed assets may change on deploy, so browsers only reuse them briefly
+UNHASHED_MAX_AGE = 300
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into a mapping of encoding to q-value."""
+    accepted = {}
+    for token in header.split(","):
+        encoding, *params = (part.strip() for part in token.split(";"))
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[encoding.lower()] = quality
+    return accepted
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves `.br`/`.gz` siblings and sets Cache-Control.
+
+    A precompressed sibling (e.g. `app.js.br`) is served instead of the
+    original when the client accepts that encoding (q-value above 0).
+    Content-hashed assets are cached for a year; everything else for a few
+    minutes, after which it is revalidated via ETag.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        accepted = parse_accept_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        response = None
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+            if accepted.get(encoding, accepted.get("*", 0.0)) <= 0:
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue
+            response.headers["Content-Encoding"] = encoding
+            # Report the type of the original file, not of the compressed sibling
+            media_type, _ = mimetypes.guess_type(path)
+            if media_type and "content-type" in response.headers:
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                response.headers["Content-Type"] = media_type
+            break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers["Vary"] = "Accept-Encoding"
+        if HASHED_NAME.search(path):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = f"public, max-age={UNHASHED_MAX_AGE}"
+        return response